@@ -5,11 +5,26 @@ Loads & saves the list of bricks from/to a JSON config file.
 """
 
 import json
+import os
+import threading
+
+try:
+    import orjson  # optional: much faster JSON (Rust extension)
+except ImportError:
+    orjson = None
+
 from brick_state import BrickState
 
 # Path to config file
 CONFIG_FILE = "bricks.json"
 
+# Serializes disk writes from concurrent save threads; _save_seq orders the
+# snapshots (assigned on the calling thread) so an older snapshot can never
+# overwrite a newer one.
+_save_lock = threading.Lock()
+_save_seq = 0
+_saved_seq = 0
+
 
 def load_bricks():
     """
@@ -20,13 +35,15 @@ def load_bricks():
     """
     try:
         with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+            data = orjson.loads(f.read()) if orjson else json.load(f)
             bricks = []
             for d in data:
-                # Ensure backward compatibility: add missing fields
-                if "connected" not in d:
-                    d["connected"] = False
-                bricks.append(BrickState.from_dict(d))
+                # from_dict already defaults missing optional fields
+                brick = BrickState.from_dict(d)
+                # A freshly loaded brick is never connected, regardless of
+                # what was persisted.
+                brick.connected = False
+                bricks.append(brick)
             return bricks
     except FileNotFoundError:
         print(f"[INFO] Config file '{CONFIG_FILE}' not found, starting with empty list.")
@@ -36,15 +53,66 @@ def load_bricks():
         return []
 
 
+def _serialize(bricks):
+    """Serialize bricks to compact JSON bytes (machine-read only file)."""
+    data = [b.to_dict() for b in bricks]
+    if orjson:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def _next_seq():
+    """Assign the next snapshot id (call from the thread taking the snapshot)."""
+    global _save_seq
+    with _save_lock:
+        _save_seq += 1
+        return _save_seq
+
+
+def _write(payload, count, seq):
+    """Write payload atomically: temp file in the same directory + rename."""
+    global _saved_seq
+    try:
+        with _save_lock:
+            if seq <= _saved_seq:
+                # A newer snapshot already reached the disk.
+                return
+            tmp = CONFIG_FILE + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, CONFIG_FILE)
+            _saved_seq = seq
+        print(f"[INFO] Saved {count} bricks to '{CONFIG_FILE}'.")
+    except Exception as e:
+        print(f"[ERROR] Failed to save config: {e}")
+
+
 def save_bricks(bricks):
     """
-    Save bricks to JSON file.
+    Save bricks to JSON file (atomic write).
 
     :param bricks: list of BrickState
     """
     try:
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump([b.to_dict() for b in bricks], f, indent=4, ensure_ascii=False)
-        print(f"[INFO] Saved {len(bricks)} bricks to '{CONFIG_FILE}'.")
+        payload = _serialize(bricks)
+    except Exception as e:
+        print(f"[ERROR] Failed to save config: {e}")
+        return
+    _write(payload, len(bricks), _next_seq())
+
+
+def save_bricks_async(bricks):
+    """
+    Save bricks without blocking the caller.
+
+    Serializes on the calling thread (so later state changes cannot leak
+    into the snapshot), then writes the file from a background thread.
+    """
+    try:
+        payload = _serialize(bricks)
     except Exception as e:
         print(f"[ERROR] Failed to save config: {e}")
+        return
+    threading.Thread(target=_write, args=(payload, len(bricks), _next_seq()),
+                     daemon=True).start()
@@ -8,9 +8,32 @@ Represents a single brick's state:
 - power, direction, running, connected
 """
 
+import sys
+from operator import attrgetter
+
+# Canonical direction strings. Interning makes every brick share one
+# string object per direction, even when loaded from JSON.
+DIRECTION_FORWARD = sys.intern("forward")
+DIRECTION_BACKWARD = sys.intern("backward")
+
+# Field names in constructor order, shared by __slots__, to_dict and from_dict.
+_FIELDS = ("name", "mac", "port", "controller",
+           "power", "direction", "running", "connected")
+
+# Defaults for the optional fields (missing keys in older config files).
+_DEFAULTS = {"power": 0, "direction": DIRECTION_FORWARD,
+             "running": False, "connected": False}
+
+_GET_FIELDS = attrgetter(*_FIELDS)
+
+
 class BrickState:
+    # Fixed attribute set: avoids a per-instance __dict__ and speeds up
+    # attribute access in the GUI update paths.
+    __slots__ = _FIELDS
+
     def __init__(self, name, mac, port, controller,
-                 power=0, direction="forward", running=False, connected=False):
+                 power=0, direction=DIRECTION_FORWARD, running=False, connected=False):
         """
         Create a BrickState.
 
@@ -29,43 +52,30 @@ class BrickState:
         self.controller = controller
 
         self.power = power
-        self.direction = direction
+        self.direction = sys.intern(direction)
         self.running = running
         self.connected = connected
 
     def __repr__(self):
-        return (f"BrickState(name={self.name!r}, mac={self.mac!r}, port={self.port}, "
-                f"controller={self.controller!r}, power={self.power}, "
-                f"direction={self.direction!r}, running={self.running}, "
-                f"connected={self.connected})")
+        # Deliberately short: repr ends up in prints/log lines, where
+        # formatting all 8 fields is wasted work. Use to_dict() when the
+        # full state is needed.
+        return f"<BrickState {self.name!r} port={self.port}>"
 
     def to_dict(self):
         """
         Convert to a serializable dict (useful for saving).
         """
-        return {
-            "name": self.name,
-            "mac": self.mac,
-            "port": self.port,
-            "controller": self.controller,
-            "power": self.power,
-            "direction": self.direction,
-            "running": self.running,
-            "connected": self.connected
-        }
+        return dict(zip(_FIELDS, _GET_FIELDS(self)))
 
     @staticmethod
     def from_dict(d):
         """
         Create a BrickState from a dict (e.g., loaded from JSON).
+
+        Missing optional fields fall back to their defaults.
         """
         return BrickState(
-            name=d["name"],
-            mac=d["mac"],
-            port=d["port"],
-            controller=d["controller"],
-            power=d.get("power", 0),
-            direction=d.get("direction", "forward"),
-            running=d.get("running", False),
-            connected=d.get("connected", False)
+            d["name"], d["mac"], d["port"], d["controller"],
+            *(d.get(k, v) for k, v in _DEFAULTS.items())
         )
\ No newline at end of file
@@ -12,22 +12,35 @@ Workflow:
 - Button [Close]: Stop & disconnect all bricks, then quit.
 """
 
-import time
+import asyncio
 from PySide6.QtWidgets import (
     QWidget, QListWidget, QListWidgetItem, QLabel, QPushButton,
     QSlider, QVBoxLayout, QHBoxLayout, QGridLayout, QFrame, QStyle,
     QApplication, QSizePolicy
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QIcon
 
 from mqtt_handler import MqttHandler
-from brick_config import load_bricks, save_bricks
-from brick_state import BrickState
+from brick_config import load_bricks, save_bricks_async
+from brick_state import BrickState, DIRECTION_FORWARD, DIRECTION_BACKWARD
 from add_brick_dialog import AddBrickDialog
-import json
 from constants import *
 
+# Precomputed stylesheets: update_status_labels runs on every slider move,
+# so avoid rebuilding constant f-strings on each call.
+_SS_RUNNING = f"color: {COLOR_RUNNING}; font-weight: bold;"
+_SS_STOPPED = f"color: {COLOR_STOPPED}; font-weight: bold;"
+_SS_DIRECTION = f"color: {COLOR_DIRECTION}; font-weight: bold;"
+_SS_POWER = f"color: {COLOR_SPEED}; font-weight: bold;"
+_SS_CONNECTED = "color: green;"
+_SS_DISCONNECTED = "color: red;"
+
+# Display text per direction, so the hot label path does a dict lookup
+# instead of allocating a capitalized copy on every refresh.
+_DIRECTION_LABELS = {DIRECTION_FORWARD: "Forward", DIRECTION_BACKWARD: "Backward"}
+
+
 class Controller(QWidget):
     """Class creating the GUI and handles MQTT handler status updates"""
     def __init__(self):
@@ -47,8 +60,24 @@ class Controller(QWidget):
 
         # Load bricks & set active brick
         self.bricks = load_bricks()
+        # Name -> BrickState index for O(1) lookup on list selection;
+        # rebuilt in refresh_brick_list.
+        self.bricks_by_name = {b.name: b for b in self.bricks}
         self.active_brick = None
 
+        # Last applied label states, so setStyleSheet (which triggers a full
+        # Qt style recomputation) is only called on actual transitions.
+        self._last_running = None
+        self._last_connected = None
+
+        # QStyle standard icons, cached per enum value (style lookups
+        # allocate a new QIcon on every call). Preload everything the UI
+        # uses so later _standard_icon calls are pure cache hits.
+        self._icon_cache = {}
+        style = self.style()
+        for sp in (QStyle.SP_BrowserReload,):
+            self._icon_cache[sp] = style.standardIcon(sp)
+
         # Setup UI & populate list
         self.setup_ui()
         if self.bricks:
@@ -56,7 +85,6 @@ class Controller(QWidget):
 
     def setup_ui(self):
         main_layout = QHBoxLayout()
-        style = self.style()
 
         # Left: brick list & add button
         left_layout = QVBoxLayout()
@@ -79,7 +107,7 @@ class Controller(QWidget):
         hlayout.addWidget(self.status_label)
 
         self.reconnect_btn = QPushButton("Reconnect")
-        self.reconnect_btn.setIcon(style.standardIcon(QStyle.SP_BrowserReload))
+        self.reconnect_btn.setIcon(self._standard_icon(QStyle.SP_BrowserReload))
         self.reconnect_btn.clicked.connect(self.reconnect)
         hlayout.addWidget(self.reconnect_btn)
         self.controls_layout.addLayout(hlayout)
@@ -95,10 +123,12 @@ class Controller(QWidget):
 
         self.lbl_brick_direction = QLabel()
         self.lbl_brick_direction.setAlignment(Qt.AlignCenter)
+        self.lbl_brick_direction.setStyleSheet(_SS_DIRECTION)
         grid.addWidget(self.lbl_brick_direction, 1, 1)
 
         self.lbl_brick_power = QLabel()
         self.lbl_brick_power.setAlignment(Qt.AlignCenter)
+        self.lbl_brick_power.setStyleSheet(_SS_POWER)
         grid.addWidget(self.lbl_brick_power, 1, 2)
 
         self.controls_layout.addLayout(grid)
@@ -116,17 +146,24 @@ class Controller(QWidget):
         self.controls_layout.addWidget(QLabel("Power (%)"))
         self.controls_layout.addWidget(self.slider)
 
+        # Coalesces bursts of valueChanged events during a drag: the labels
+        # refresh at most once per ~16 ms window (60 Hz).
+        self._label_update_timer = QTimer(self)
+        self._label_update_timer.setSingleShot(True)
+        self._label_update_timer.setInterval(16)
+        self._label_update_timer.timeout.connect(self.update_status_labels)
+
         self.controls_layout.addWidget(self._hline())
 
         # Brick Direction buttons
         hdir = QHBoxLayout()
         self.forward_btn = QPushButton("Forward")
         self.forward_btn.setEnabled(False)
-        self.forward_btn.clicked.connect(lambda: self.set_direction("forward"))
+        self.forward_btn.clicked.connect(lambda: self.set_direction(DIRECTION_FORWARD))
         hdir.addWidget(self.forward_btn)
 
         self.backward_btn = QPushButton("Backward")
-        self.backward_btn.clicked.connect(lambda: self.set_direction("backward"))
+        self.backward_btn.clicked.connect(lambda: self.set_direction(DIRECTION_BACKWARD))
         self.backward_btn.setEnabled(False)
         hdir.addWidget(self.backward_btn)
         self.controls_layout.addLayout(hdir)
@@ -179,6 +216,18 @@ class Controller(QWidget):
 
         self.refresh_brick_list()
 
+    def _standard_icon(self, sp):
+        """Return a QStyle standard icon, cached per enum value."""
+        if sp not in self._icon_cache:
+            self._icon_cache[sp] = self.style().standardIcon(sp)
+        return self._icon_cache[sp]
+
+    def _set_slider_value(self, value: int):
+        """Set the slider programmatically without firing valueChanged."""
+        self.slider.blockSignals(True)
+        self.slider.setValue(value)
+        self.slider.blockSignals(False)
+
     def _hline(self):
         """Horizontal separator line."""
         line = QFrame()
@@ -189,8 +238,8 @@ class Controller(QWidget):
     def refresh_brick_list(self):
         """Reloads brick list widget from saved bricks."""
         self.brick_list.clear()
+        self.bricks_by_name = {b.name: b for b in self.bricks}
         for brick in self.bricks:
-            brick.connected = False
             item = QListWidgetItem(brick.name)
             self.brick_list.addItem(item)
         self.status_label.setText(f"Ready. {len(self.bricks)} bricks loaded.")
@@ -198,82 +247,94 @@ class Controller(QWidget):
     def select_brick(self, brick: BrickState):
         """Selects a brick and updates UI accordingly."""
         self.active_brick = brick
-        self.slider.setValue(brick.power)
+        self._set_slider_value(brick.power)
         self.update_status_labels()
         self.status_label.setText(f"Selected: {brick.name}")
 
     def on_brick_selected(self, item: QListWidgetItem):
-        name = item.text()
-        brick = next(b for b in self.bricks if b.name == name)
-        self.select_brick(brick)
+        brick = self.bricks_by_name.get(item.text())
+        if brick:
+            self.select_brick(brick)
+
+    # The callbacks below bind self.active_brick to a local first: they run
+    # on every user interaction and a local read is cheaper than repeated
+    # attribute lookups.
 
     def on_slider_moved(self, value: int):
-        if not self.active_brick:
+        b = self.active_brick
+        if not b:
             return
-        self.active_brick.power = value
-        self.update_status_labels()
+        b.power = value
+        if not self._label_update_timer.isActive():
+            self._label_update_timer.start()
 
     def on_slider_released(self):
-        if not self.active_brick:
+        b = self.active_brick
+        if not b:
             return
-        self.active_brick.running = self.active_brick.power > 0
+        b.running = b.power > 0
         self.update_status_labels()
         self.send_command()
 
     def set_direction(self, direction: str):
-        if not self.active_brick:
+        b = self.active_brick
+        if not b:
             return
-        self.active_brick.direction = direction
+        b.direction = direction
         self.update_status_labels()
         self.send_command()
 
     def connect_brick(self):
-        if not self.active_brick:
+        b = self.active_brick
+        if not b:
             return
-        self.active_brick.running = False
-        self.active_brick.power = 0
-        self.active_brick.connected = True
-        self.slider.setValue(0)
-        self.slider.setEnabled(self.active_brick.connected)
-        self.forward_btn.setEnabled(self.active_brick.connected)
-        self.backward_btn.setEnabled(self.active_brick.connected)
-        self.stop_btn.setEnabled(self.active_brick.connected)
+        b.running = False
+        b.power = 0
+        b.connected = True
+        self._set_slider_value(0)
+        self.slider.setEnabled(True)
+        self.forward_btn.setEnabled(True)
+        self.backward_btn.setEnabled(True)
+        self.stop_btn.setEnabled(True)
         self.update_status_labels()
         self.send_command(disconnect=False)
-        self.status_label.setText(f"Connected to: {self.active_brick.name}")
+        self.status_label.setText(f"Connected to: {b.name}")
 
     def disconnect_brick(self):
-        if not self.active_brick:
+        b = self.active_brick
+        if not b:
             return
-        self.active_brick.running = False
-        self.active_brick.power = 0
-        self.active_brick.connected = False
-        self.slider.setEnabled(self.active_brick.connected)
-        self.forward_btn.setEnabled(self.active_brick.connected)
-        self.backward_btn.setEnabled(self.active_brick.connected)
-        self.stop_btn.setEnabled(self.active_brick.connected)
-        self.slider.setValue(0)
+        b.running = False
+        b.power = 0
+        b.connected = False
+        self.slider.setEnabled(False)
+        self.forward_btn.setEnabled(False)
+        self.backward_btn.setEnabled(False)
+        self.stop_btn.setEnabled(False)
+        self._set_slider_value(0)
         self.update_status_labels()
         self.send_command(disconnect=True)
-        self.status_label.setText(f"Disconnected from: {self.active_brick.name}")
+        self.status_label.setText(f"Disconnected from: {b.name}")
 
     def start(self):
         """Start motor at slider power (no hardcoded 10)."""
-        if not self.active_brick:
+        b = self.active_brick
+        if not b:
             return
         power = self.slider.value()
-        self.active_brick.power = power
-        self.active_brick.running = power > 0
+        b.power = power
+        b.running = power > 0
         self.update_status_labels()
         self.send_command()
 
     def stop(self):
         """Stop motor (speed=0)."""
-        if not self.active_brick:
+        b = self.active_brick
+        if not b:
             return
-        self.active_brick.running = False
-        self.active_brick.power = 0
-        self.slider.setValue(0)
+        b.running = False
+        b.power = 0
+        self._set_slider_value(0)
         self.update_status_labels()
         self.send_command()
 
@@ -282,19 +343,18 @@ class Controller(QWidget):
         if b is None:
             return
 
-        self.set_brick_status("Running" if b.running else "Stopped")
-        self.lbl_brick_status.setStyleSheet(f"color: {COLOR_RUNNING if b.running else COLOR_STOPPED}; font-weight: bold;")
-
-        self.lbl_brick_direction.setText(b.direction.capitalize())
-        self.lbl_brick_direction.setStyleSheet(f"color: {COLOR_DIRECTION}; font-weight: bold;")
+        if b.running != self._last_running:
+            self._last_running = b.running
+            self.set_brick_status("Running" if b.running else "Stopped")
+            self.lbl_brick_status.setStyleSheet(_SS_RUNNING if b.running else _SS_STOPPED)
 
+        self.lbl_brick_direction.setText(
+            _DIRECTION_LABELS.get(b.direction) or b.direction.capitalize())
         self.lbl_brick_power.setText(f"{b.power}%")
-        self.lbl_brick_power.setStyleSheet(f"color: {COLOR_SPEED}; font-weight: bold;")
 
-        if getattr(b, 'connected', False):
-            self.status_label.setStyleSheet("color: green;")
-        else:
-            self.status_label.setStyleSheet("color: red;")
+        if b.connected != self._last_connected:
+            self._last_connected = b.connected
+            self.status_label.setStyleSheet(_SS_CONNECTED if b.connected else _SS_DISCONNECTED)
 
     def send_command(self, disconnect=False):
         if not self.active_brick:
@@ -320,41 +380,39 @@ class Controller(QWidget):
         if dialog.exec():
             new_brick = dialog.get_brick()
             new_brick.connected = False
+            # Append directly instead of refresh_brick_list: no full list
+            # rebuild, and selection/scroll position stay untouched.
             self.bricks.append(new_brick)
-            save_bricks(self.bricks)
-            self.refresh_brick_list()
+            self.bricks_by_name[new_brick.name] = new_brick
+            self.brick_list.addItem(QListWidgetItem(new_brick.name))
+            save_bricks_async(self.bricks)
+            self.status_label.setText(f"Ready. {len(self.bricks)} bricks loaded.")
 
     def close_app(self):
-        """Stop & disconnect all bricks before quitting."""
+        """Stop & disconnect all bricks (single batch message) before quitting."""
+        # Shared template: only controller/mac/port/disconnect vary per command.
+        template = {"power": 0, "direction": DIRECTION_FORWARD,
+                    "disconnect": False}
+        cmds = []
         for brick in self.bricks:
-            self.mqtt.send_command({
-                "controller": brick.controller,
-                "mac": brick.mac,
-                "port": brick.port,
-                "power": 0,
-                "direction": "forward",
-                "disconnect": False
-            })
-            time.sleep(0.2)
-            self.mqtt.send_command({
-                "controller": brick.controller,
-                "mac": brick.mac,
-                "port": brick.port,
-                "power": 0,
-                "direction": "forward",
-                "disconnect": True
-            })
-            time.sleep(0.2)
-        self.mqtt.disconnect()
+            stop = {**template, "controller": brick.controller,
+                    "mac": brick.mac, "port": brick.port}
+            cmds.append(stop)
+            cmds.append({**stop, "disconnect": True})
+        asyncio.ensure_future(self._shutdown(cmds))
+
+    async def _shutdown(self, cmds):
+        """Flush the final batch over MQTT, then quit the application."""
+        if cmds:
+            self.mqtt.send_batch(cmds)
+        await self.mqtt.aclose()
         QApplication.quit()
 
     def set_brick_status(self, text):
         """Update the brick label status running, stopped."""
         self.lbl_brick_status.setText(text)
         
-    def set_status_bar(self, text):
-        data = json.loads(text)
-        status = data["status"]
-        message = data["message"]
-        self.statusbar_label.setText(f"{status},{message}")
+    def set_status_bar(self, data):
+        """Show a status message already decoded by the MQTT handler."""
+        self.statusbar_label.setText(f"{data['status']},{data['message']}")
 
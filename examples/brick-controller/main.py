@@ -7,19 +7,24 @@ Starts the Qt application and event loop.
 Requires:
 - PySide6
 - qasync
+- aiomqtt
 """
 
 import sys
-from PySide6.QtWidgets import QApplication
-from qasync import QEventLoop
-from controller import Controller
 
 def main():
+    # Heavy imports (PySide6, qasync, aiomqtt via controller) are done here
+    # instead of at module level, so importing main stays cheap and the
+    # interpreter starts up faster.
+    from PySide6.QtWidgets import QApplication
+    from qasync import QEventLoop
+
     app = QApplication(sys.argv)
     loop = QEventLoop(app)
     import asyncio
     asyncio.set_event_loop(loop)
 
+    from controller import Controller
     window = Controller()
     window.show()
 
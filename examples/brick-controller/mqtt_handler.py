@@ -1,89 +1,155 @@
-"""
-Brick-Controller - mqtt_handler
------------------------------
-Handles connection to MQTT and sending structured JSON commands.
-
-Example:
-cmd = {
-    "controller": CONTROLLER_TYPE,
-    "mac": MAC_ADDRESS,
-    "port": 0,
-    "power": self.power,
-    "direction": self.direction,
-    "disconnect": disconnect
-}
-"""
-
-import json
-import paho.mqtt.client as mqtt
-from PySide6.QtCore import Signal, QObject
-from constants import MQTT_BROKER, MQTT_PORT, MQTT_TOPIC_COMMAND, MQTT_TOPIC_RESPONSE
-
-class MqttHandler(QObject):
-    message_received = Signal(str)  # Define a signal to carry the message
-    
-    def __init__(self, parent=None):
-        super().__init__(parent)  # THIS LINE is required!
-        self.client = mqtt.Client()
-        self.connected = False
-        self.client.on_connect = self.on_connect
-        self.client.on_disconnect = self.on_disconnect
-        self.client.on_message = self.on_message
-        self.client.on_log = self.on_log  # optional for debug
-
-    def on_connect(self, client, userdata, flags, rc):
-        #pylint: disable=unused-argument
-        if rc == 0:
-            self.connected = True
-            print(f"[MQTT] Connected to {MQTT_BROKER}:{MQTT_PORT}")
-            # subscribe to response topic
-            client.subscribe(MQTT_TOPIC_RESPONSE)
-            print(f"[MQTT] Subscribed to {MQTT_TOPIC_RESPONSE}")
-        else:
-            print(f"[MQTT] Connection failed with code {rc}")
-
-    def on_disconnect(self, client, userdata, rc):
-        #pylint: disable=unused-argument
-        self.connected = False
-        print("[MQTT] Disconnected")
-
-    def on_message(self, client, userdata, msg):
-        #pylint: disable=unused-argument
-        # handle incoming messages here
-        try:
-            payload = msg.payload.decode()
-            print(f"[MQTT] Received on {msg.topic}: {payload}")
-            # emit signal so GUI can update
-            self.message_received.emit(payload)
-        except Exception as e:
-            print(f"[MQTT] Failed to process message: {e}")
-
-    def on_log(self, client, userdata, level, buf):
-        # Uncomment for verbose logging
-        # print(f"[MQTT LOG] {buf}")
-        pass
-
-    def connect(self):
-        try:
-            self.client.connect(MQTT_BROKER, MQTT_PORT, 60)
-            self.client.loop_start()
-        except Exception as e:
-            print(f"[MQTT] Connection failed: {e}")
-
-    def disconnect(self):
-        if self.connected:
-            self.client.loop_stop()
-            self.client.disconnect()
-            self.connected = False
-            print("[MQTT] Disconnected")
-
-    def send_command(self, cmd: dict):
-        if not self.connected:
-            print("[MQTT] Not connected, cannot send command")
-            return
-        try:
-            payload = json.dumps(cmd)
-            self.client.publish(MQTT_TOPIC_COMMAND, payload)
-            print(f"[MQTT] Sent: {payload}")
-        except Exception as e:
-            print(f"[MQTT] Send failed: {e}")
+"""
+Brick-Controller - mqtt_handler
+-----------------------------
+Handles connection to MQTT and sending structured JSON commands.
+
+Runs on the application's qasync/asyncio event loop via aiomqtt, so no
+extra network thread is needed: the reader task and publish tasks are
+plain asyncio tasks interleaved with the Qt event loop.
+
+Example:
+cmd = {
+    "controller": CONTROLLER_TYPE,
+    "mac": MAC_ADDRESS,
+    "port": 0,
+    "power": self.power,
+    "direction": self.direction,
+    "disconnect": disconnect
+}
+"""
+
+import asyncio
+import json
+
+try:
+    import orjson  # optional: much faster JSON (Rust extension)
+except ImportError:
+    orjson = None
+
+# Payloads stay bytes end-to-end: _dumps produces bytes for the client to
+# send as-is, _loads accepts the raw message payload without an
+# intermediate decode.
+if orjson:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+    _loads = json.loads
+
+import aiomqtt
+from PySide6.QtCore import Signal, QObject
+from constants import MQTT_BROKER, MQTT_PORT, MQTT_TOPIC_COMMAND, MQTT_TOPIC_RESPONSE
+
+# Commands per batch message. The firmware parses a batch into a 2048-byte
+# buffer (CommandHandler.h) and its MQTT client accepts 2048-byte packets
+# (MqttHandler::begin); 8 commands stay safely within both.
+_BATCH_CHUNK = 8
+
+class MqttHandler(QObject):
+    message_received = Signal(dict)  # Carries the decoded status message
+
+    def __init__(self, parent=None):
+        super().__init__(parent)  # THIS LINE is required!
+        self.client = None
+        self.connected = False
+        self._task = None          # reader task (connection lifetime)
+        self._pending = set()      # in-flight publish tasks
+
+    async def _run(self):
+        """Hold the connection and forward incoming messages to the GUI."""
+        client = None
+        try:
+            async with aiomqtt.Client(MQTT_BROKER, port=MQTT_PORT) as client:
+                self.client = client
+                self.connected = True
+                print(f"[MQTT] Connected to {MQTT_BROKER}:{MQTT_PORT}")
+                await client.subscribe(MQTT_TOPIC_RESPONSE)
+                print(f"[MQTT] Subscribed to {MQTT_TOPIC_RESPONSE}")
+                async for msg in client.messages:
+                    try:
+                        # Decode once here, so the GUI slot gets a
+                        # ready-to-use dict.
+                        data = _loads(msg.payload)
+                        print(f"[MQTT] Received on {msg.topic}: {data}")
+                        self.message_received.emit(data)
+                    except Exception as e:
+                        print(f"[MQTT] Failed to process message: {e}")
+        except asyncio.CancelledError:
+            pass
+        except aiomqtt.MqttError as e:
+            print(f"[MQTT] Connection failed: {e}")
+        finally:
+            # Reconnect cancels this task and starts a new one; its teardown
+            # can finish after the new task has already connected. Only clear
+            # state that still belongs to this task's connection.
+            if self.client is client:
+                self.client = None
+                self.connected = False
+            print("[MQTT] Disconnected")
+
+    async def _publish(self, client, payload, qos):
+        try:
+            await client.publish(MQTT_TOPIC_COMMAND, payload, qos=qos)
+        except aiomqtt.MqttError as e:
+            print(f"[MQTT] Send failed: {e}")
+
+    def _schedule_publish(self, payload, qos):
+        """Queue a publish on the event loop; keep a reference until done."""
+        # Capture the client now: self.client can become None before the
+        # task runs if the connection drops in between.
+        client = self.client
+        if client is None:
+            print("[MQTT] Not connected, cannot send")
+            return
+        task = asyncio.ensure_future(self._publish(client, payload, qos))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def connect(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def disconnect(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        self.connected = False
+
+    async def aclose(self):
+        """Flush pending publishes, then drop the connection (shutdown)."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        task = self._task
+        self.disconnect()
+        if task:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def send_command(self, cmd: dict):
+        if not self.connected:
+            print("[MQTT] Not connected, cannot send command")
+            return
+        # Fire-and-forget with QoS 0: the publish runs as a task on the
+        # event loop without blocking the caller.
+        payload = _dumps(cmd)
+        self._schedule_publish(payload, qos=0)
+        print(f"[MQTT] Sent: {payload}")
+
+    def send_batch(self, cmds: list):
+        """
+        Publish several commands in one message: {"batch": [cmd1, cmd2, ...]}.
+
+        Avoids per-command publish overhead, e.g. when stopping and
+        disconnecting all bricks on close.
+        """
+        if not self.connected:
+            print("[MQTT] Not connected, cannot send batch")
+            return
+        # Chunk so each message fits the firmware's 2048-byte buffers.
+        for i in range(0, len(cmds), _BATCH_CHUNK):
+            payload = _dumps({"batch": cmds[i:i + _BATCH_CHUNK]})
+            self._schedule_publish(payload, qos=1)
+        print(f"[MQTT] Sent batch of {len(cmds)} commands")
@@ -16,6 +16,11 @@
  *   "disconnect":false
  * }
  *
+ * Several commands can be sent in one message as a batch, executed in order:
+ * {
+ *   "batch":[ {command1}, {command2}, ... ]
+ * }
+ *
  * Author: Robert W.B. Linn
  * Copyright © 2025 Robert W.B. Linn
  * License: MIT — see LICENSE file.
@@ -34,26 +39,14 @@
 // add more like a custom controller
 
 /**
- * @brief Handles a JSON command string.
+ * @brief Executes a single parsed JSON command.
  *
- * Creates and registers controllers on-demand and executes commands.
+ * Creates and registers controllers on-demand and executes the command.
  *
- * @param jsonCommand A String containing the JSON command.
+ * @param doc A parsed JSON command object.
  * @return String with status:msg, where status is ok or error.
  */
-inline String handleCommand(const String& jsonCommand) {
-    LOGI("[CommandHandler] Handling JSON: %s", jsonCommand.c_str());
-
-    StaticJsonDocument<512> doc;
-    DeserializationError err = deserializeJson(doc, jsonCommand);
-
-    if (err) {
-        LOGE("[CommandHandler] JSON parse error: %s", err.c_str());
-        return StringUtils::formatStatus(COMMAND_STATUS::ERROR,
-                                         "JSON parse error: %s", 
-                                         err.c_str());
-    }
-
+inline String handleSingleCommand(JsonVariantConst doc) {
     String ctrlName   = doc[COMMAND::CONTROLLER]   | "";
     String mac        = doc[COMMAND::MAC]          | "";
     int port          = doc[COMMAND::PORT]         | -1;
@@ -163,3 +156,51 @@ inline String handleCommand(const String& jsonCommand) {
     return msg;
 }
 
+/**
+ * @brief Handles a JSON command string, single or batch.
+ *
+ * A payload {"batch":[cmd1,cmd2,...]} executes the commands in order
+ * (e.g. the GUI stops and disconnects all bricks in one message on close);
+ * any other payload is treated as one command.
+ *
+ * @param jsonCommand A String containing the JSON command(s).
+ * @return String with status:msg, where status is ok or error.
+ */
+inline String handleCommand(const String& jsonCommand) {
+    LOGI("[CommandHandler] Handling JSON: %s", jsonCommand.c_str());
+
+    // Matches the MQTT buffer set in MqttHandler::begin. Holds roughly
+    // 8 commands per message; senders must chunk larger batches (the GUI
+    // does, see mqtt_handler.py send_batch).
+    StaticJsonDocument<2048> doc;
+    DeserializationError err = deserializeJson(doc, jsonCommand);
+
+    if (err) {
+        LOGE("[CommandHandler] JSON parse error: %s", err.c_str());
+        return StringUtils::formatStatus(COMMAND_STATUS::ERROR,
+                                         "JSON parse error: %s",
+                                         err.c_str());
+    }
+
+    JsonArrayConst batch = doc[COMMAND::BATCH].as<JsonArrayConst>();
+    if (!batch.isNull()) {
+        size_t failed = 0;
+        for (JsonVariantConst cmd : batch) {
+            String msg = handleSingleCommand(cmd);
+            if (msg.indexOf(COMMAND_STATUS::ERROR) >= 0) {
+                failed++;
+            }
+        }
+        if (failed > 0) {
+            return StringUtils::formatStatus(COMMAND_STATUS::ERROR,
+                                             "Batch: %u of %u commands failed",
+                                             (unsigned)failed, (unsigned)batch.size());
+        }
+        return StringUtils::formatStatus(COMMAND_STATUS::OK,
+                                         "Batch: executed %u commands",
+                                         (unsigned)batch.size());
+    }
+
+    return handleSingleCommand(doc.as<JsonVariantConst>());
+}
+
@@ -54,6 +54,8 @@ namespace COMMAND {
     constexpr const char* DISCONNECT = "disconnect";
     constexpr const char* FORWARD    = "forward";
     constexpr const char* BACKWARD   = "backward";
+    constexpr const char* BATCH      = "batch";         // Array of commands
+
 }
 
 // ============================================================================
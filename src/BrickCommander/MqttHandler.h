@@ -56,6 +56,11 @@ public:
         brokerUsername = String(username);
         brokerPassword = String(password);
 
+        // Inbound packets above PubSubClient's 256-byte default are silently
+        // dropped before the callback runs; batch command messages need the
+        // same headroom as the parse buffer in CommandHandler.h.
+        client.setBufferSize(2048);
+
         // Set the MQTT broker using ip & port
         client.setServer(broker, port);
         LOGI("[MqttHandler][begin] Broker set to %s:%d", broker, port);